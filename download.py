@@ -1,73 +1,473 @@
+import atexit
+import logging
+import queue
+import random
+import signal
 import sys
-from yt_dlp import YoutubeDL
 import os
 import re
+import shelve
+import socket
+import threading
 import time
-from typing import Optional, List, Dict, Tuple
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import cache, lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from itertools import islice
 from urllib.parse import urlparse, parse_qs
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+
+if TYPE_CHECKING:
+    from yt_dlp import YoutubeDL
 
 MAX_RETRIES = 3
 RETRY_DELAY = 2
 MAX_CONCURRENT_WORKERS = 5
 DEFAULT_CONCURRENT_WORKERS = 3
+# Failed-download details kept for the summary; beyond this only counters grow.
+MAX_REPORTED_FAILURES = 50
+# YouTube throttles individual connections, so a single video downloads far
+# faster when its DASH fragments are fetched in parallel over several
+# connections (10 MiB ranged requests each).
+CONCURRENT_FRAGMENT_DOWNLOADS = 4
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+# Set YTDL_USE_ARIA2C=1 to delegate downloads to aria2c with 16 segmented
+# connections — useful on links where even parallel fragments are throttled.
+USE_ARIA2C = os.environ.get('YTDL_USE_ARIA2C', '').lower() in ('1', 'true', 'yes')
+# Optional player-client override, e.g. YTDL_PLAYER_CLIENT=tv,web_safari,mweb.
+# Some clients hand back pre-signed stream URLs, skipping the per-video
+# player-JS download and decipher step entirely; which ones do changes as
+# YouTube evolves, so this stays a knob rather than a hardcoded pin.
+PLAYER_CLIENTS = [
+    client.strip()
+    for client in os.environ.get('YTDL_PLAYER_CLIENT', '').split(',')
+    if client.strip()
+]
+# Resolved once at import — avoids re-joining cwd on every invocation.
+_DEFAULT_OUTPUT_DIR = Path.cwd() / 'downloads'
+
+# Post-processing (ffmpeg merge/extract) is CPU-bound while downloads are
+# network-bound; without a bound, N workers can spawn N ffmpeg processes at
+# once and starve the machine. Half the cores keeps ffmpeg off the critical
+# path while downloads continue on the remaining workers.
+_FFMPEG_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+_ffmpeg_semaphore = threading.BoundedSemaphore(_FFMPEG_WORKERS)
+
+
+def _postprocessor_throttle(d: Dict) -> None:
+    """yt-dlp postprocessor hook bounding concurrent ffmpeg runs."""
+    if d.get('status') == 'started':
+        # A slot already held by this thread (previous postprocessor failed
+        # without firing 'finished') is reused, never acquired twice.
+        if not getattr(_thread_state, 'holds_ffmpeg_slot', False):
+            _ffmpeg_semaphore.acquire()
+            _thread_state.holds_ffmpeg_slot = True
+    elif d.get('status') == 'finished':
+        _release_ffmpeg_slot()
+
+
+# Worker threads are reused across download_youtube_content calls instead of
+# being spawned and torn down per batch — material when the module is embedded
+# in a long-lived process (web wrapper) issuing repeated batches.
+_download_pool: Optional[ThreadPoolExecutor] = None
+_download_pool_lock = threading.Lock()
+
+
+def _get_download_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Return the shared worker pool, creating it on first use.
+
+    The pool is sized once for the largest concurrency the module allows;
+    each call enforces its own max_workers with a semaphore instead.
+    """
+    global _download_pool
+    with _download_pool_lock:
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(
+                max_workers=max(MAX_CONCURRENT_WORKERS, max_workers),
+                thread_name_prefix='ytdl')
+            atexit.register(_download_pool.shutdown, wait=False)
+        return _download_pool
+
+
+# Set on Ctrl-C so workers stop burning retry delays on downloads nobody
+# wants anymore. In-flight transfers finish; waiting retries abort instantly.
+_cancel_event = threading.Event()
+
+
+def _request_cancel(signum, frame) -> None:
+    """SIGINT handler: let running downloads finish but skip pending retries."""
+    if not _cancel_event.is_set():
+        _cancel_event.set()
+        print("\n🛑 Cancellation requested — finishing in-flight downloads, skipping retries...")
+
+
+def _release_ffmpeg_slot() -> None:
+    """Release this thread's ffmpeg slot if held (safe to call repeatedly)."""
+    if getattr(_thread_state, 'holds_ffmpeg_slot', False):
+        _thread_state.holds_ffmpeg_slot = False
+        _ffmpeg_semaphore.release()
+
+
+# Static portion of the download options, built once instead of per URL.
+# Per-call keys (format, postprocessors, outtmpl, merge_output_format) are
+# layered on top of a shallow copy in download_single_video.
+_BASE_YDL_OPTS = MappingProxyType({
+    'ignoreerrors': True,
+    'no_warnings': False,
+    'noplaylist': False,
+    'extract_flat': False,
+    'keepvideo': False,
+    'clean_infojson': True,
+    'retries': MAX_RETRIES,
+    'fragment_retries': MAX_RETRIES,
+    'concurrent_fragment_downloads': CONCURRENT_FRAGMENT_DOWNLOADS,
+    'http_chunk_size': HTTP_CHUNK_SIZE,
+    # Bound stalls without tearing down the pooled instance's keep-alive
+    # connections between playlist entries.
+    'socket_timeout': 30,
+    'nocheckcertificate': True,
+    'postprocessor_hooks': [_postprocessor_throttle],
+    # Allow yt-dlp to fetch JS challenge solver scripts from GitHub.
+    # Without this, YouTube may only serve low-quality (240p/360p) streams.
+    'remote_components': ['ejs:github'],
+})
+
+# Static per-mode pieces, built once instead of per download call.
+_MP3_POSTPROCESSORS = ({
+    'key': 'FFmpegExtractAudio',
+    'preferredcodec': 'mp3',
+    'preferredquality': '192',
+},)
+# Relative outtmpl (under the output directory) by content type; '{ext}' is
+# the only per-call substitution left.
+_OUTTMPL_BY_KIND = {
+    'playlist': os.path.join('%(playlist_title)s', '%(playlist_index)s-%(title)s.{ext}'),
+    'channel': os.path.join('%(uploader)s', '%(upload_date)s-%(title)s.{ext}'),
+    'video': '%(title)s.{ext}',
+}
+
+
+@lru_cache(maxsize=64)
+def _outtmpl(output_dir: str, kind: str, ext: str) -> str:
+    """Full output template for a download; memoized since batches reuse the
+    same (directory, kind, extension) triple for every URL."""
+    template = _OUTTMPL_BY_KIND.get(kind, _OUTTMPL_BY_KIND['video'])
+    return os.path.join(output_dir, template.format(ext=ext))
+
+# Flat full-playlist listing used to size shards — no per-entry extraction.
+_COUNT_YDL_OPTS = MappingProxyType({
+    'quiet': True,
+    'extract_flat': 'in_playlist',
+    'no_warnings': True,
+    'skip_download': True,
+})
+
+# Options for the lightweight classification probe in _fetch_url_info.
+# 'in_playlist' (rather than True) flattens playlist entries but still lets
+# single-video URLs resolve normally under process=False, so the probe never
+# pays the player-JS download that full format extraction would trigger.
+_PROBE_YDL_OPTS = MappingProxyType({
+    'quiet': True,
+    'extract_flat': 'in_playlist',
+    'no_warnings': True,
+    'skip_download': True,
+    'playlist_items': '1',
+})
+
+# Compiled once: \s already covers newlines and tabs, so a single class splits
+# every supported separator style.
+_URL_SPLIT_RE = re.compile(r'[,\s]+')
+# Channel detection inside the network probe still needs a URL-shape check.
+_CHANNEL_URL_RE = re.compile(r'/(?:@|channel/|c/|user/)')
+# Kind of a URL by its first path segment; '@handle' segments are channels too.
+_PATH_SEGMENT_KIND = {
+    'watch': 'video',
+    'playlist': 'playlist',
+    'channel': 'channel',
+    'c': 'channel',
+    'user': 'channel',
+}
+# One scan of the raw input extracts every valid YouTube URL directly in the
+# C regex engine — no per-token Python dispatch. The alternation's prefixes
+# are disjoint, so no backtracking occurs.
+_YOUTUBE_URL_SCAN_RE = re.compile(
+    r'(?:https?://)?(?:[\w.-]+\.)?'
+    r'(?:youtube\.com/(?:watch\?[^\s,]+|playlist\?[^\s,]+|@[^\s,/]+'
+    r'|channel/[^\s,]+|c/[^\s,]+|user/[^\s,]+)'
+    r'|youtu\.be/[^\s,]+)'
+)
+
+# Cache DNS lookups process-wide: yt-dlp resolves youtube.com/googlevideo.com
+# over and over, and repeated getaddrinfo calls are both slow and rate-limited.
+socket.getaddrinfo = lru_cache(maxsize=64)(socket.getaddrinfo)
+
+_PREWARM_HOSTS = ('www.youtube.com', 'youtube.com', 'googlevideo.com')
+_prewarm_started = threading.Event()
+
+
+def _prewarm_dns() -> None:
+    """Resolve the YouTube hosts once so the getaddrinfo cache is warm."""
+    for host in _PREWARM_HOSTS:
+        try:
+            socket.getaddrinfo(host, 443)
+        except OSError:
+            pass
 
 
-@lru_cache(maxsize=128)
-def get_url_info(url: str) -> Tuple[str, Dict]:
+def _start_prewarm() -> None:
+    """
+    Kick off DNS prewarming on a daemon thread (at most once per process).
+
+    Started before the interactive prompts, the resolutions complete while
+    the user is still typing, so the first real request skips the resolver.
+    """
+    if not _prewarm_started.is_set():
+        _prewarm_started.set()
+        threading.Thread(target=_prewarm_dns, name='dns-prewarm', daemon=True).start()
+
+
+_thread_state = threading.local()
+
+# Worker messages funnel through one logger: under concurrency, per-thread
+# print() calls contend on the stdout lock and interleave mid-line, whereas a
+# QueueListener gives a single writer thread and clean output.
+_log = logging.getLogger('download')
+_log.setLevel(logging.INFO)
+_log.propagate = False
+
+
+def _ensure_log_handler() -> None:
+    """Attach a plain stdout handler when the logger is still bare (e.g. library use)."""
+    if not _log.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _log.addHandler(handler)
+
+
+def _process_log_init() -> None:
+    """Give a process-pool child its own stdout log handler.
+
+    A forked child inherits the parent's QueueHandler, whose queue nobody
+    drains in the child — its messages would silently vanish. Lines from
+    separate processes may interleave, but they are delivered.
+    """
+    _log.handlers = []
+    _ensure_log_handler()
+
+
+@lru_cache(maxsize=None)
+def _youtube_dl_class():
+    """
+    Import yt_dlp on first use instead of at module import.
+
+    Importing yt_dlp parses its ~1000 extractor modules and takes seconds;
+    deferring it means aborting at a prompt (or parsing URLs) never pays
+    that cost.
+    """
+    from yt_dlp import YoutubeDL
+    return YoutubeDL
+
+
+# Every pooled instance, regardless of owning thread — we skip the `with`
+# context manager (its close() would tear down the connection pool between
+# URLs), so instances are closed in one sweep at interpreter exit instead.
+_all_pooled_ydls: List['YoutubeDL'] = []
+_all_pooled_ydls_lock = threading.Lock()
+
+
+def _close_pooled_ydls() -> None:
+    """Close every pooled YoutubeDL instance (registered with atexit)."""
+    with _all_pooled_ydls_lock:
+        for ydl in _all_pooled_ydls:
+            try:
+                ydl.close()
+            except Exception:
+                pass
+        _all_pooled_ydls.clear()
+
+
+atexit.register(_close_pooled_ydls)
+
+
+def _pooled_ydl(options: Dict) -> 'YoutubeDL':
     """
-    Get URL information with caching to avoid duplicate yt-dlp calls.
-    Returns (content_type, info_dict) for efficient reuse.
+    Return a per-thread YoutubeDL instance for the given option set.
+
+    Constructing YoutubeDL is expensive (extractor registry, cookiejar,
+    HTTP connection pool), so each worker thread keeps one instance per
+    option set and reuses it across URLs and retry attempts. This also
+    preserves HTTP keep-alive connections between downloads.
+
+    Args:
+        options (Dict): yt-dlp options (outtmpl excluded — set per URL)
+
+    Returns:
+        YoutubeDL: A reusable instance owned by the calling thread
+    """
+    pool = getattr(_thread_state, 'ydl_pool', None)
+    if pool is None:
+        pool = _thread_state.ydl_pool = {}
+
+    key = repr(sorted(options.items()))
+    ydl = pool.get(key)
+    if ydl is None:
+        ydl = pool[key] = _youtube_dl_class()(dict(options))
+        with _all_pooled_ydls_lock:
+            _all_pooled_ydls.append(ydl)
+    return ydl
+
+
+# Probe results survive across runs in a small shelve database, so the
+# playlist/channel preflight in download_single_video skips the network
+# probe for already-seen URLs (plain videos never probe at all — their type
+# comes from the URL shape alone).
+_INFO_CACHE_DIR = Path.home() / '.cache' / 'download-simply-videos'
+# A collection's type is stable (a playlist URL stays a playlist), so a
+# day-long TTL is safe and spares the re-probe on every CLI invocation.
+_INFO_CACHE_TTL = 86400
+_disk_cache_lock = threading.Lock()
+
+_info_locks: Dict[str, threading.Lock] = {}
+_info_locks_guard = threading.Lock()
+
+
+def _load_cached_type(url: str) -> Optional[str]:
+    """Return the on-disk classification for url, or None if absent/stale."""
+    try:
+        with _disk_cache_lock:
+            with shelve.open(str(_INFO_CACHE_DIR / 'url_info')) as db:
+                content_type, stored_at = db[url]
+        if time.time() - stored_at < _INFO_CACHE_TTL:
+            return content_type
+    except Exception:
+        pass
+    return None
+
+
+def _store_cached_type(url: str, content_type: str) -> None:
+    """Persist the classification for url; failures are non-fatal."""
+    try:
+        _INFO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with _disk_cache_lock:
+            with shelve.open(str(_INFO_CACHE_DIR / 'url_info')) as db:
+                db[url] = (content_type, time.time())
+    except Exception:
+        pass
+
+
+# Unbounded cache on purpose: the values are three short strings, so even a
+# very long session retains only URL keys — unlike lru_cache there is no
+# eviction bookkeeping on hits. _fetch_url_info stays bounded (128) because
+# it can hold multi-MB info dicts.
+@cache
+def _classify_by_url(url: str) -> str:
+    """
+    Classify a YouTube URL as 'video', 'playlist' or 'channel' from its
+    shape alone — no network access.
+
+    One urlparse plus a dict lookup on the first path segment replaces
+    repeated whole-string substring scans.
+    """
+    parsed = urlparse(url)
+    parts = parsed.path.split('/', 2)
+    # Scheme-less URLs keep the host in path[0]; the segment is next either way.
+    segment = parts[1] if len(parts) > 1 else parts[0]
+    if segment.startswith('@'):
+        return 'channel'
+    kind = _PATH_SEGMENT_KIND.get(segment, 'video')
+    if kind == 'video' and 'list' in parse_qs(parsed.query):
+        # A watch URL carrying a list= parameter downloads as a playlist.
+        return 'playlist'
+    return kind
+
+
+def get_url_info(url: str, need_metadata: bool = False) -> Tuple[str, Dict]:
+    """
+    Get URL information, classifying by URL shape whenever possible.
+
+    Well-formed YouTube URLs encode their type (watch/playlist/channel)
+    directly, so the default path is pure string parsing. The expensive
+    yt-dlp extraction only runs when the caller needs actual metadata
+    (title, entries); a per-URL lock then coalesces concurrent misses so
+    extraction runs at most once per URL per process.
 
     Args:
         url (str): YouTube URL to analyze
+        need_metadata (bool): If True, fetch the info dict via yt-dlp
 
     Returns:
         Tuple[str, Dict]: (content_type, info_dict) where content_type is 'video', 'playlist', or 'channel'
     """
+    if not need_metadata:
+        return _classify_by_url(url), {}
+
+    with _info_locks_guard:
+        lock = _info_locks.setdefault(url, threading.Lock())
+    with lock:
+        return _fetch_url_info(url)
+
+
+@lru_cache(maxsize=128)
+def _fetch_url_info(url: str) -> Tuple[str, Dict]:
+    """Resolve (content_type, info_dict), consulting the disk cache first."""
+    cached_type = _load_cached_type(url)
+    if cached_type is not None:
+        return cached_type, {}
+
     try:
-        ydl_opts = {
-            'quiet': True,
-            'extract_flat': True,
-            'no_warnings': True,
-            'skip_download': True,
-            'playlist_items': '1',
-        }
-
-        with YoutubeDL(ydl_opts) as ydl:
-            video_info = ydl.extract_info(url, download=False)
-
-            if video_info is None:
-                parsed_url = urlparse(url)
-                query_params = parse_qs(parsed_url.query)
-                if '/@' in url or '/channel/' in url or '/c/' in url or '/user/' in url:
-                    return 'channel', {}
-                elif 'list' in query_params:
-                    return 'playlist', {}
-                else:
-                    return 'video', {}
-
-            content_type = video_info.get('_type', 'video')
-
-            if content_type == 'playlist':
-                if video_info.get('uploader_id') and ('/@' in url or '/channel/' in url or '/c/' in url or '/user/' in url):
-                    return 'channel', video_info
-                else:
-                    return 'playlist', video_info
-
-            return content_type, video_info
+        # Pooled rather than freshly constructed: consecutive probes reuse the
+        # same HTTP connection pool and TLS session.
+        ydl = _pooled_ydl(_PROBE_YDL_OPTS)
+        # process=False skips format selection and URL signing — for
+        # classification we only need the raw extractor output.
+        video_info = ydl.extract_info(url, download=False, process=False)
+
+        if video_info is None:
+            return _classify_by_url(url), {}
+
+        entries = video_info.get('entries')
+        if entries is not None and not isinstance(entries, list):
+            # Unprocessed playlists expose entries lazily; materialize a
+            # handful so empty playlists are still distinguishable.
+            video_info['entries'] = list(islice(entries, 5))
+
+        content_type = video_info.get('_type', 'video')
+
+        if content_type == 'playlist':
+            if video_info.get('uploader_id') and _CHANNEL_URL_RE.search(url):
+                _store_cached_type(url, 'channel')
+                return 'channel', video_info
+            else:
+                _store_cached_type(url, 'playlist')
+                return 'playlist', video_info
+
+        _store_cached_type(url, content_type)
+        return content_type, video_info
 
     except Exception:
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
+        return _classify_by_url(url), {}
 
-        if '/@' in url or '/channel/' in url or '/c/' in url or '/user/' in url:
-            return 'channel', {}
-        elif 'list' in query_params:
-            return 'playlist', {}
-        else:
-            return 'video', {}
+
+def _playlist_entry_count(url: str) -> Optional[int]:
+    """
+    Count the entries of a playlist with one flat listing request.
+
+    Returns None when the count can't be determined (network error,
+    non-playlist URL) — callers then fall back to an unsharded download.
+    """
+    try:
+        info = _pooled_ydl(_COUNT_YDL_OPTS).extract_info(url, download=False)
+        if not info:
+            return None
+        count = info.get('playlist_count')
+        if count is None:
+            entries = info.get('entries')
+            count = len(entries) if isinstance(entries, list) else None
+        return count
+    except Exception:
+        return None
 
 
 def get_content_type(url: str) -> str:
@@ -95,29 +495,23 @@ def parse_multiple_urls(input_string: str) -> List[str]:
     Returns:
         List[str]: List of cleaned URLs
     """
-    urls = re.split(r'[,\s\n\t]+', input_string.strip())
-    urls = [url.strip() for url in urls if url.strip()]
-
-    valid_urls = []
-    invalid_count = 0
-    for url in urls:
-        if ('youtube.com' in url or 'youtu.be' in url) and (
-            '/watch?' in url or
-            '/playlist?' in url or
-            '/@' in url or
-            '/channel/' in url or
-            '/c/' in url or
-            '/user/' in url or
-            'youtu.be/' in url
-        ):
-            valid_urls.append(url)
-        elif url:
-            print(f"⚠️  Skipping invalid URL: {url}")
-            invalid_count += 1
-
-    if invalid_count > 0:
-        print(
-            f"💡 Found {len(valid_urls)} valid YouTube URLs, skipped {invalid_count} invalid entries")
+    valid_urls = _YOUTUBE_URL_SCAN_RE.findall(input_string)
+
+    # Tokenize only to report what was skipped; on an all-valid paste the
+    # count check below keeps this a single extra C-level split with no
+    # per-token Python work.
+    tokens = [token for token in _URL_SPLIT_RE.split(input_string.strip()) if token]
+    if len(tokens) != len(valid_urls):
+        # A token is valid when it *contains* a match — the scan can extract
+        # a URL from inside wrappers like parentheses, so exact membership
+        # against the extracted URLs would misreport such tokens as skipped.
+        invalid_tokens = [
+            token for token in tokens if not _YOUTUBE_URL_SCAN_RE.search(token)]
+        for token in invalid_tokens:
+            print(f"⚠️  Skipping invalid URL: {token}")
+        if invalid_tokens:
+            print(
+                f"💡 Found {len(valid_urls)} valid YouTube URLs, skipped {len(invalid_tokens)} invalid entries")
 
     return valid_urls
 
@@ -135,35 +529,38 @@ def get_available_formats(url: str) -> None:
     }
 
     try:
-        with YoutubeDL(ydl_opts) as ydl:
-            ydl.extract_info(url, download=False)
+        _pooled_ydl(ydl_opts).extract_info(url, download=False)
     except Exception as error:
         print(f"Error listing formats: {str(error)}")
 
 
-def download_single_video(url: str, output_path: str, thread_id: int = 0, audio_only: bool = False, max_resolution: Optional[int] = None) -> dict:
+def download_single_video(url: str, output_path: Union[str, Path], thread_id: int = 0, audio_only: bool = False,
+                          max_resolution: Optional[int] = None, content_type: Optional[str] = None,
+                          playlist_items: Optional[str] = None) -> dict:
     """
     Download a single YouTube video, playlist, or channel with retry mechanism.
 
     Args:
         url (str): YouTube URL to download (video, playlist, or channel)
-        output_path (str): Directory to save the download
+        output_path (str | Path): Directory to save the download
         thread_id (int): Thread identifier for logging
         audio_only (bool): If True, download audio only in MP3 format
         max_resolution (int, optional): Maximum video height (e.g., 720, 1080, 1440, 2160). None = best available.
+        content_type (str, optional): Pre-computed 'video'/'playlist'/'channel' kind; looked up when omitted.
+        playlist_items (str, optional): yt-dlp index range (e.g. '1-50') limiting which playlist entries to download.
 
     Returns:
         dict: Result status with success/failure info
     """
+    _ensure_log_handler()
+    output_path = Path(output_path)
+
     if audio_only:
         format_selector = 'bestaudio/best'
         file_extension = 'mp3'
-        postprocessors = [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }]
-        print(f"🎵 [Thread {thread_id}] Audio-only mode: Downloading MP3...")
+        # Shared constant is safe: yt-dlp copies each postprocessor def.
+        postprocessors = list(_MP3_POSTPROCESSORS)
+        _log.info(f"🎵 [Thread {thread_id}] Audio-only mode: Downloading MP3...")
     else:
         # Use separate video+audio streams for best quality
         # Note: h264 (avc1) maxes at 1080p on YouTube; VP9/AV1 are used for 1440p/4K
@@ -180,93 +577,132 @@ def download_single_video(url: str, output_path: str, thread_id: int = 0, audio_
         # Only remux (no re-encoding) when merging separate streams
         postprocessors = []
 
-    downloader_options = {
-        'format': format_selector,
-        'ignoreerrors': True,
-        'no_warnings': False,
-        'noplaylist': False,
-        'extract_flat': False,
-        'postprocessors': postprocessors,
-        'keepvideo': False,
-        'clean_infojson': True,
-        'retries': MAX_RETRIES,
-        'fragment_retries': MAX_RETRIES,
-        'nocheckcertificate': True,
-        # Allow yt-dlp to fetch JS challenge solver scripts from GitHub.
-        # Without this, YouTube may only serve low-quality (240p/360p) streams.
-        'remote_components': ['ejs:github'],
-    }
+    downloader_options = dict(_BASE_YDL_OPTS)
+    downloader_options['format'] = format_selector
+    downloader_options['postprocessors'] = postprocessors
 
     if not audio_only:
         downloader_options['merge_output_format'] = 'mp4'
 
-    content_type, _ = get_url_info(url)
+    if USE_ARIA2C:
+        downloader_options['external_downloader'] = 'aria2c'
+        downloader_options['external_downloader_args'] = ['-x', '16', '-s', '16']
+
+    if PLAYER_CLIENTS:
+        downloader_options['extractor_args'] = {'youtube': {'player_client': PLAYER_CLIENTS}}
+
+    # Completed downloads are recorded in a per-directory archive, so a re-run
+    # after a crash (or of an updated playlist) skips the entries already on
+    # disk instead of paying their bandwidth again. The archive is loaded when
+    # the pooled instance is built, making the skip check an in-memory lookup.
+    downloader_options['download_archive'] = str(output_path / '.ytdlp-archive.txt')
+
+    if content_type is None:
+        content_type = get_content_type(url)
+
+    # Collections get one flat metadata probe (memory/disk cached, misses
+    # coalesced per URL) so an empty or private playlist fails fast here
+    # rather than paying a full extraction guaranteed to download nothing.
+    # The probe also distinguishes channels from playlist-shaped URLs.
+    if content_type in ('playlist', 'channel'):
+        probed_type, cached_info = get_url_info(url, need_metadata=True)
+        if probed_type in ('playlist', 'channel'):
+            content_type = probed_type
+        probe_entries = cached_info.get('entries')
+        if isinstance(probe_entries, list) and not probe_entries:
+            return {
+                'url': url,
+                'success': False,
+                'count': 0,
+                'message': f"❌ [Thread {thread_id}] {content_type.title()} appears to be empty or private"
+            }
 
+    outtmpl = _outtmpl(str(output_path), content_type, file_extension)
     if content_type == 'playlist':
-        downloader_options['outtmpl'] = os.path.join(
-            output_path, '%(playlist_title)s', f'%(playlist_index)s-%(title)s.{file_extension}')
-        print(f"📋 [Thread {thread_id}] Detected playlist URL. Downloading entire playlist...")
-        print(f"📁 [Thread {thread_id}] Files will be saved to: {output_path}/[playlist_name]/")
+        scope = f"entries {playlist_items}" if playlist_items else "entire playlist"
+        _log.info(f"📋 [Thread {thread_id}] Detected playlist URL. Downloading {scope}...")
+        _log.info(f"📁 [Thread {thread_id}] Files will be saved to: {output_path}/[playlist_name]/")
     elif content_type == 'channel':
-        downloader_options['outtmpl'] = os.path.join(
-            output_path, '%(uploader)s', f'%(upload_date)s-%(title)s.{file_extension}')
-        print(f"📺 [Thread {thread_id}] Detected channel URL. Downloading entire channel...")
-        print(f"📁 [Thread {thread_id}] Files will be saved to: {output_path}/[channel_name]/")
+        _log.info(f"📺 [Thread {thread_id}] Detected channel URL. Downloading entire channel...")
+        _log.info(f"📁 [Thread {thread_id}] Files will be saved to: {output_path}/[channel_name]/")
     else:
-        downloader_options['outtmpl'] = os.path.join(
-            output_path, f'%(title)s.{file_extension}')
-        print(f"🎥 [Thread {thread_id}] Detected single video URL. Downloading {'audio' if audio_only else 'video'}...")
-        print(f"📁 [Thread {thread_id}] File will be saved to: {output_path}/")
+        _log.info(f"🎥 [Thread {thread_id}] Detected single video URL. Downloading {'audio' if audio_only else 'video'}...")
+        _log.info(f"📁 [Thread {thread_id}] File will be saved to: {output_path}/")
+
+    # outtmpl stays out of the pooled options so one instance serves every URL;
+    # mutate the normalized outtmpl dict in place for this download.
+    ydl = _pooled_ydl(downloader_options)
+    ydl.params['outtmpl']['default'] = outtmpl
+    # Read lazily during playlist iteration, so per-call mutation is safe;
+    # None restores the full range for unsharded downloads.
+    ydl.params['playlist_items'] = playlist_items
 
     last_exception = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            with YoutubeDL(downloader_options) as ydl:
+            try:
                 download_result = ydl.extract_info(url, download=True)
+            finally:
+                # With ignoreerrors a failed postprocessor is reported by
+                # yt-dlp rather than raised, so neither the 'finished' hook
+                # nor our except path would run — sweep the slot here so a
+                # swallowed ffmpeg error can't strand it.
+                _release_ffmpeg_slot()
+
+            if download_result is None:
+                return {
+                    'url': url,
+                    'success': False,
+                    'count': 0,
+                    'message': f"❌ [Thread {thread_id}] Failed to extract video information. Video may be private or unavailable."
+                }
 
-                if download_result is None:
+            if download_result.get('_type') == 'playlist':
+                title = download_result.get('title', 'Unknown Playlist')
+                video_count = sum(1 for e in download_result.get('entries', []) if e is not None)
+                _log.info(f"📋 [Thread {thread_id}] {content_type.title()}: '{title}' ({video_count} videos)")
+
+                if video_count == 0:
                     return {
                         'url': url,
                         'success': False,
                         'count': 0,
-                        'message': f"❌ [Thread {thread_id}] Failed to extract video information. Video may be private or unavailable."
+                        'message': f"❌ [Thread {thread_id}] {content_type.title()} appears to be empty or private"
                     }
 
-                if download_result.get('_type') == 'playlist':
-                    title = download_result.get('title', 'Unknown Playlist')
-                    video_count = sum(1 for e in download_result.get('entries', []) if e is not None)
-                    print(f"📋 [Thread {thread_id}] {content_type.title()}: '{title}' ({video_count} videos)")
-
-                    if video_count == 0:
-                        return {
-                            'url': url,
-                            'success': False,
-                            'count': 0,
-                            'message': f"❌ [Thread {thread_id}] {content_type.title()} appears to be empty or private"
-                        }
-
-                    return {
-                        'url': url,
-                        'success': True,
-                        'count': video_count,
-                        'message': f"✅ [Thread {thread_id}] {content_type.title()} '{title}' download completed! ({video_count} {'MP3s' if audio_only else 'videos'}) 📂 Location: {output_path}"
-                    }
-                else:
-                    title = download_result.get('title', 'Unknown')
-                    return {
-                        'url': url,
-                        'success': True,
-                        'count': 1,
-                        'message': f"✅ [Thread {thread_id}] {'Audio' if audio_only else 'Video'} '{title}' download completed! 📂 Location: {output_path}"
-                    }
+                return {
+                    'url': url,
+                    'success': True,
+                    'count': video_count,
+                    'message': f"✅ [Thread {thread_id}] {content_type.title()} '{title}' download completed! ({video_count} {'MP3s' if audio_only else 'videos'}) 📂 Location: {output_path}"
+                }
+            else:
+                title = download_result.get('title', 'Unknown')
+                return {
+                    'url': url,
+                    'success': True,
+                    'count': 1,
+                    'message': f"✅ [Thread {thread_id}] {'Audio' if audio_only else 'Video'} '{title}' download completed! 📂 Location: {output_path}"
+                }
 
         except Exception as error:
             last_exception = error
             if attempt < MAX_RETRIES:
-                retry_delay = RETRY_DELAY * (2 ** (attempt - 1))
-                error_msg = f"⚠️  [Thread {thread_id}] Attempt {attempt}/{MAX_RETRIES} failed: {str(error)[:100]}. Retrying in {retry_delay}s..."
-                print(error_msg)
-                time.sleep(retry_delay)
+                # Equal jitter keeps the exponential growth but desynchronizes
+                # workers, so parallel failures don't all retry in lockstep.
+                backoff = RETRY_DELAY * (2 ** (attempt - 1))
+                retry_delay = backoff / 2 + random.uniform(0, backoff / 2)
+                error_msg = f"⚠️  [Thread {thread_id}] Attempt {attempt}/{MAX_RETRIES} failed: {str(error)[:100]}. Retrying in {retry_delay:.1f}s..."
+                _log.info(error_msg)
+                # wait() instead of sleep(): returns True immediately on Ctrl-C
+                # rather than blocking for the full delay.
+                if _cancel_event.wait(timeout=retry_delay):
+                    return {
+                        'url': url,
+                        'success': False,
+                        'count': 0,
+                        'message': f"🛑 [Thread {thread_id}] Cancelled while waiting to retry. Last error: {str(last_exception)}"
+                    }
             else:
                 return {
                     'url': url,
@@ -283,30 +719,40 @@ def download_single_video(url: str, output_path: str, thread_id: int = 0, audio_
     }
 
 
-def download_youtube_content(urls: List[str], output_path: Optional[str] = None,
-                             list_formats: bool = False, max_workers: int = DEFAULT_CONCURRENT_WORKERS, 
-                             audio_only: bool = False, max_resolution: Optional[int] = None) -> None:
+def download_youtube_content(urls: List[str], output_path: Optional[Union[str, Path]] = None,
+                             list_formats: bool = False, max_workers: int = DEFAULT_CONCURRENT_WORKERS,
+                             audio_only: bool = False, max_resolution: Optional[int] = None,
+                             use_processes: bool = False) -> None:
     """
     Download YouTube content (single videos, playlists, or channels) in MP4 format or MP3 audio only.
     Supports multiple URLs for simultaneous downloading with optimized concurrency.
 
     Args:
         urls (List[str]): List of YouTube URLs to download (videos, playlists, or channels)
-        output_path (str, optional): Directory to save the downloads. Defaults to './downloads'
+        output_path (str | Path, optional): Directory to save the downloads. Defaults to './downloads'
         list_formats (bool): If True, only list available formats without downloading
         max_workers (int): Maximum number of concurrent downloads (1-5, default=3)
         audio_only (bool): If True, download audio only in MP3 format
         max_resolution (int, optional): Maximum video height (e.g., 720, 1080, 1440, 2160). None = best available.
+        use_processes (bool): If True, run workers in separate processes — sidesteps the GIL
+            for CPU-heavy extraction (JSON parsing, signature deciphering) on large batches.
     """
-    if output_path is None:
-        output_path = os.path.join(os.getcwd(), 'downloads')
-
+    # Listing needs exactly one extractor call — skip prewarm, path setup,
+    # directory creation and classification entirely.
     if list_formats:
         print("Available formats for the first provided URL:")
         get_available_formats(urls[0])
         return
 
-    os.makedirs(output_path, exist_ok=True)
+    _start_prewarm()
+
+    output_path = Path(output_path) if output_path is not None else _DEFAULT_OUTPUT_DIR
+
+    if not output_path.exists():
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    if use_processes:
+        max_workers = max(1, min(max_workers, len(urls), os.cpu_count() or 1))
 
     print(
         f"\n🚀 Starting download of {len(urls)} URL(s) with {max_workers} concurrent {'worker' if max_workers == 1 else 'workers'}...")
@@ -318,67 +764,149 @@ def download_youtube_content(urls: List[str], output_path: Optional[str] = None,
     else:
         print("🎧 Format: MP4 Video (best quality)")
 
-    playlist_count = sum(
-        1 for url in urls if get_content_type(url) == 'playlist')
-    channel_count = sum(
-        1 for url in urls if get_content_type(url) == 'channel')
-    video_count = len(urls) - playlist_count - channel_count
+    # Classify every URL exactly once; the kinds feed both the content
+    # summary and the workers, which then skip their own lookup.
+    url_kinds = [(url, get_content_type(url)) for url in urls]
+
+    counts = {'playlist': 0, 'channel': 0, 'video': 0}
+    for _, kind in url_kinds:
+        counts[kind] += 1
 
     content_summary = []
-    if playlist_count > 0:
-        content_summary.append(f"{playlist_count} playlist(s)")
-    if channel_count > 0:
-        content_summary.append(f"{channel_count} channel(s)")
-    if video_count > 0:
-        content_summary.append(f"{video_count} video(s)")
+    if counts['playlist'] > 0:
+        content_summary.append(f"{counts['playlist']} playlist(s)")
+    if counts['channel'] > 0:
+        content_summary.append(f"{counts['channel']} channel(s)")
+    if counts['video'] > 0:
+        content_summary.append(f"{counts['video']} video(s)")
 
     if content_summary:
         print(f"📋 Content: {' + '.join(content_summary)}")
     else:
         print("🎥 Content: Unknown content type")
 
+    # Jobs are (url, kind, playlist_items-range). A lone playlist URL would
+    # pin one worker while the rest idle, so its index range is sharded into
+    # one contiguous slice per worker; yt-dlp's concurrent fragment downloads
+    # then parallelize within each entry as usual.
+    jobs: List[Tuple[str, str, Optional[str]]] = [
+        (url, kind, None) for url, kind in url_kinds]
+    if len(jobs) == 1 and max_workers > 1 and jobs[0][1] == 'playlist':
+        entry_count = _playlist_entry_count(jobs[0][0])
+        if entry_count and entry_count > max_workers:
+            shard_size = -(-entry_count // max_workers)  # ceil division
+            jobs = [
+                (jobs[0][0], 'playlist',
+                 f'{start}-{min(start + shard_size - 1, entry_count)}')
+                for start in range(1, entry_count + 1, shard_size)
+            ]
+            print(f"📦 Sharding playlist ({entry_count} videos) into {len(jobs)} ranges for parallel download")
+
     print("-" * 60)
 
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {
-            executor.submit(download_single_video, url, output_path, i+1, audio_only, max_resolution): url
-            for i, url in enumerate(urls)
-        }
+    # Stream results into counters instead of holding every result dict:
+    # on huge batches only a bounded sample of failures stays in memory.
+    successful_urls = 0
+    failed_urls = 0
+    total_successful_count = 0
+    total_failed_count = 0
+    failed_sample: List[dict] = []
+
+    # Process pools can't outlive the call (their workers hold pickled state),
+    # but the thread path reuses the shared pool; a per-call semaphore then
+    # caps this batch at max_workers without resizing the pool. Created
+    # before the handler swap below, and each child installs its own stream
+    # handler via the initializer, so no worker logs into the parent's queue.
+    owned_executor: Optional[ProcessPoolExecutor] = None
+    if use_processes:
+        owned_executor = executor = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_process_log_init)
+        worker = download_single_video
+    else:
+        executor = _get_download_pool(max_workers)
+        batch_slots = threading.Semaphore(max_workers)
+
+        def worker(url, path, tid, audio, res, kind, items):
+            with batch_slots:
+                return download_single_video(url, path, tid, audio, res, kind, items)
+
+    # One dedicated thread drains the log queue and writes to stdout, so N
+    # workers never contend on the stream lock or garble each other's lines.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = QueueListener(log_queue, stream_handler)
+    previous_handlers = _log.handlers[:]
+    _log.handlers = [QueueHandler(log_queue)]
+    listener.start()
 
-        for future in as_completed(future_to_url):
+    try:
+        # Results carry their own URL, so a plain list is enough — no need
+        # for a future->url mapping.
+        futures = [
+            executor.submit(worker, url, output_path, i+1,
+                            audio_only, max_resolution, kind, items)
+            for i, (url, kind, items) in enumerate(jobs)
+        ]
+
+        for future in as_completed(futures):
             result = future.result()
-            results.append(result)
-            print(result['message'])
+            _log.info(result['message'])
+            if result['success']:
+                successful_urls += 1
+                total_successful_count += result.get('count', 1)
+            else:
+                failed_urls += 1
+                total_failed_count += result.get('count', 1)
+                if len(failed_sample) < MAX_REPORTED_FAILURES:
+                    failed_sample.append(result)
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown()
+        listener.stop()
+        _log.handlers = previous_handlers
 
     print("\n" + "=" * 60)
     print("📊 DOWNLOAD SUMMARY")
     print("=" * 60)
 
-    successful_downloads = [r for r in results if r['success']]
-    failed_downloads = [r for r in results if not r['success']]
-
-    total_successful_count = sum(r.get('count', 1) for r in successful_downloads)
-    total_failed_count = sum(r.get('count', 1) for r in failed_downloads)
-
     print(f"✅ Successful downloads: {total_successful_count} {'files' if total_successful_count != 1 else 'file'}")
     print(f"❌ Failed downloads: {total_failed_count} {'files' if total_failed_count != 1 else 'file'}")
 
-    if failed_downloads:
-        print("\n❌ Failed URLs:")
-        for result in failed_downloads:
-            print(f"   • {result['url']}")
-            print(f"     Reason: {result['message']}")
-
-    if successful_downloads:
+    if failed_sample:
+        # One buffered write instead of two line-flushed prints per failure.
+        lines = ["\n❌ Failed URLs:"]
+        lines.extend(
+            f"   • {result['url']}\n     Reason: {result['message']}"
+            for result in failed_sample
+        )
+        if failed_urls > len(failed_sample):
+            lines.append(f"   … and {failed_urls - len(failed_sample)} more")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    if successful_urls:
         print(f"\n🎉 All files saved to: {output_path}")
 
 
+def download_youtube_content_single(url: str, **kwargs) -> None:
+    """
+    Backward-compatible wrapper around download_youtube_content for callers
+    still passing a single URL string.
+
+    Args:
+        url (str): YouTube URL to download
+        **kwargs: Forwarded to download_youtube_content
+    """
+    download_youtube_content([url], **kwargs)
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--list-formats':
         url = input("Enter the YouTube URL to list formats: ")
         download_youtube_content([url], list_formats=True)
     else:
+        _start_prewarm()
+
         print("📥 YouTube Multi-Content Downloader")
         print("=" * 50)
         print("💡 SUPPORTED INPUT FORMATS:")
@@ -401,16 +929,15 @@ if __name__ == "__main__":
 
         if not user_input.strip():
             print("📝 Multi-line mode activated!")
-            print("💡 Enter one URL per line, press Enter twice when finished:")
-            urls_list = []
-            line_count = 1
-            while True:
-                line = input(f"   URL {line_count}: ")
-                if line.strip() == "":
+            print("💡 Paste your URLs, then press Enter on an empty line (or Ctrl-D) to finish:")
+            # Raw readline loop: one prompt up front, no per-line prompt
+            # formatting, so pasting hundreds of URLs is instant.
+            lines = []
+            for line in iter(sys.stdin.readline, ''):
+                if not line.strip():
                     break
-                urls_list.append(line)
-                line_count += 1
-            user_input = '\n'.join(urls_list)
+                lines.append(line)
+            user_input = ''.join(lines)
 
         if not user_input.strip():
             print("❌ No URLs entered. Exiting...")
@@ -467,7 +994,9 @@ if __name__ == "__main__":
                 print("📺 Selected: Best available quality")
 
         max_workers = 1
-        if len(urls) > 1:
+        # A lone playlist/channel URL still benefits from workers: its index
+        # range is sharded across them, so prompt in that case too.
+        if len(urls) > 1 or get_content_type(urls[0]) in ('playlist', 'channel'):
             workers_input = input(
                 f"Number of concurrent downloads (1-{MAX_CONCURRENT_WORKERS}, default={DEFAULT_CONCURRENT_WORKERS}): ").strip()
             try:
@@ -476,6 +1005,8 @@ if __name__ == "__main__":
             except ValueError:
                 max_workers = DEFAULT_CONCURRENT_WORKERS
 
+        signal.signal(signal.SIGINT, _request_cancel)
+
         print(f"\n🎬 Starting downloads...")
         print(f"📊 URLs to download: {len(urls)}")
         if audio_only:
@@ -484,7 +1015,7 @@ if __name__ == "__main__":
             print(f"🎙️ Format: MP4 Video (max {max_resolution}p)")
         else:
             print("🎙️ Format: MP4 Video (best quality)")
-        if len(urls) > 1:
+        if max_workers > 1:
             print(f"⚡ Concurrent workers: {max_workers}")
         print(
             f"📁 Output: {output_dir if output_dir else 'default (./downloads)'}")
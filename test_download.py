@@ -16,6 +16,8 @@ from yt_dlp import YoutubeDL
 
 from download import (
     download_single_video,
+    get_content_type,
+    parse_multiple_urls,
 )
 
 TEST_URL = "https://www.youtube.com/watch?v=K3SR37pIzVs"
@@ -71,6 +73,73 @@ def _resolve_format(url: str) -> dict:
         return {"info": info, "selected": selected}
 
 
+# ---------------------------------------------------------------------------
+# Test: URL parsing (offline — fast)
+# ---------------------------------------------------------------------------
+
+class TestParseMultipleUrls(unittest.TestCase):
+    """Verify URL splitting and validation across separator styles."""
+
+    def test_single_url(self):
+        self.assertEqual(
+            parse_multiple_urls("https://www.youtube.com/watch?v=K3SR37pIzVs"),
+            ["https://www.youtube.com/watch?v=K3SR37pIzVs"],
+        )
+
+    def test_mixed_separators(self):
+        urls = parse_multiple_urls(
+            "https://www.youtube.com/watch?v=a, https://youtu.be/b\n"
+            "https://www.youtube.com/playlist?list=c\thttps://www.youtube.com/@chan"
+        )
+        self.assertEqual(len(urls), 4)
+
+    def test_invalid_urls_skipped(self):
+        urls = parse_multiple_urls(
+            "https://www.youtube.com/watch?v=a not-a-url https://example.com/watch?v=b"
+        )
+        self.assertEqual(urls, ["https://www.youtube.com/watch?v=a"])
+
+    def test_channel_url_styles(self):
+        for url in (
+            "https://www.youtube.com/@channelname",
+            "https://www.youtube.com/channel/UCabc123",
+            "https://www.youtube.com/c/channelname",
+            "https://www.youtube.com/user/username",
+        ):
+            self.assertEqual(parse_multiple_urls(url), [url])
+
+    def test_empty_input(self):
+        self.assertEqual(parse_multiple_urls("   \n\t "), [])
+
+
+class TestContentTypeClassification(unittest.TestCase):
+    """Verify URL-shape classification (no network)."""
+
+    def test_video_url(self):
+        self.assertEqual(get_content_type(TEST_URL), "video")
+
+    def test_playlist_url(self):
+        self.assertEqual(
+            get_content_type("https://www.youtube.com/playlist?list=PLabc"),
+            "playlist",
+        )
+
+    def test_watch_url_with_list_param(self):
+        self.assertEqual(
+            get_content_type("https://www.youtube.com/watch?v=abc&list=PLabc"),
+            "playlist",
+        )
+
+    def test_channel_urls(self):
+        for url in (
+            "https://www.youtube.com/@channelname",
+            "https://www.youtube.com/channel/UCabc123",
+            "https://www.youtube.com/c/channelname",
+            "https://www.youtube.com/user/username",
+        ):
+            self.assertEqual(get_content_type(url), "channel")
+
+
 # ---------------------------------------------------------------------------
 # Test: format selection (no download — fast)
 # ---------------------------------------------------------------------------